@@ -24,10 +24,12 @@ def main():
     # --- Show results ---
     print("--- Entities Detected by the Analyzer ---")
     print("The presidio analyzer detects the following entities in the text (internal process):")
-    for result in analyzer_results:
-        print(f"Entity: {result.entity_type}, Score: {result.score:.2f}, "
-              f"Start: {result.start}, End: {result.end}, "
-              f"Text: '{original_text[result.start:result.end]}'")
+    print("\n".join(
+        f"Entity: {result.entity_type}, Score: {result.score:.2f}, "
+        f"Start: {result.start}, End: {result.end}, "
+        f"Text: '{original_text[result.start:result.end]}'"
+        for result in analyzer_results
+    ))
     print()
     
     print("--- Anonymized Text ---")
@@ -39,6 +41,8 @@ def main():
         deanonymized_result = anonymizer.deanonymize_with_entities(anonymized_result.text, analyzer_results)
         print()
         print(f"--- Deanonymized Text ---\n{deanonymized_result.text}")
+        if deanonymized_result.error:
+            print(f"\n[Note: {deanonymized_result.error}]")
     except Exception as e:
         print(f"\n--- Deanonymization Note ---")
         print(f"Deanonymization only works for entities that were encrypted (reversible operations).")
@@ -1,23 +1,51 @@
+import os
+
 from presidio_anonymizer.entities import OperatorConfig
 
 # --- NLP Configuration ---
-NLP_CONFIGURATION = {
-    "nlp_engine_name": "spacy",
-    "models": [{"lang_code": "en", "model_name": "en_core_web_sm"}],
+# Select with the NLP_PROFILE environment variable (default: spacy_sm)
+NLP_PROFILES = {
+    # No NLP model at all: only Presidio's pattern recognizers run (no PERSON/LOCATION detection)
+    "regex_only": {
+        "nlp_engine_name": "no_op",
+        "models": [{"lang_code": "en", "model_name": "no_op"}],
+    },
+    
+    # Small spaCy pipeline for NER, tokens and lemmas
+    "spacy_sm": {
+        "nlp_engine_name": "spacy",
+        "models": [{"lang_code": "en", "model_name": "en_core_web_sm"}],
+    },
+    
+    # More accurate NER, not a speed option: slower and uses more memory than spacy_sm, since it loads
+    # en_core_web_sm as well as the full BERT NER model through Hugging Face
+    # (needs: pip install "presidio-analyzer[transformers]")
+    "bert_ner": {
+        "nlp_engine_name": "transformers",
+        "models": [{
+            "lang_code": "en",
+            "model_name": {"spacy": "en_core_web_sm", "transformers": "dslim/bert-base-NER"},
+        }],
+        "ner_model_configuration": {
+            "model_to_presidio_entity_mapping": {
+                "PER": "PERSON",
+                "LOC": "LOCATION",
+                "ORG": "ORGANIZATION",
+            },
+        },
+    },
 }
 
-# Generate a proper key for encryption/decryption
-# Presidio encrypt operator expects a raw key of 128, 192, or 256 bits (16, 24, or 32 bytes)
-def generate_encryption_key():
-    """Generate a proper encryption key for Presidio"""
-    # Use a fixed seed for demonstration (don't do this in production!)
-    # This ensures the same key is generated each time for demo purposes
-    import hashlib
-    seed = "presidio_demo_key_2024"
-    key_bytes = hashlib.sha256(seed.encode()).digest()  # 32 bytes = 256 bits
-    return key_bytes
+NLP_PROFILE = os.getenv("NLP_PROFILE", "spacy_sm")
+if NLP_PROFILE not in NLP_PROFILES:
+    raise ValueError(f"Unknown NLP_PROFILE '{NLP_PROFILE}', expected one of: {', '.join(NLP_PROFILES)}")
 
-encryption_key = generate_encryption_key()
+NLP_CONFIGURATION = NLP_PROFILES[NLP_PROFILE]
+
+# Encryption key for the encrypt/decrypt operators
+# Presidio encrypt operator expects a raw key of 128, 192, or 256 bits (16, 24, or 32 bytes)
+# Fixed demo key (don't do this in production!): SHA-256 of "presidio_demo_key_2024", 32 bytes = 256 bits
+encryption_key = bytes.fromhex("2bcf9fae5fb7730307e2ed1a3dafb47bf844eccae74e04eb9db2f0fd62585a66")
 
 # --- Anonymization Rules ---
 ANONYMIZATION_RULES = {
@@ -42,14 +70,29 @@ ANONYMIZATION_RULES = {
     # US Driver License replacement
     "US_DRIVER_LICENSE": OperatorConfig(operator_name="replace", params={"new_value": "[HIDDEN_DRIVER_LICENSE]"}),
     
-    "CREDIT_CARD": OperatorConfig(operator_name="encrypt", params={"key": encryption_key}),
+    # Same AES-CBC format as "encrypt" (restored by "decrypt"), reusing the AES key object across values
+    "CREDIT_CARD": OperatorConfig(operator_name="batch_encrypt", params={"key": encryption_key}),
+    # Authenticated encryption (AES-CBC + HMAC), restored by "fernet_decrypt" in DEANONYMIZATION_RULES
+    # "CREDIT_CARD": OperatorConfig(operator_name="fernet_encrypt", params={"key": encryption_key}),
     
-    "SSN": OperatorConfig(operator_name="replace", params={"new_value": "[HIDDEN_SSN]"}),
+    # Presidio reports social security numbers as "US_SSN"
+    "US_SSN": OperatorConfig(operator_name="replace", params={"new_value": "[HIDDEN_SSN]"}),
 }
 
 DEANONYMIZATION_RULES = {
     "CREDIT_CARD": OperatorConfig(operator_name="decrypt", params={"key": encryption_key}),
+    # "CREDIT_CARD": OperatorConfig(operator_name="fernet_decrypt", params={"key": encryption_key}),
 }
 
 # --- Default Language ---
-DEFAULT_LANGUAGE = "en"
\ No newline at end of file
+DEFAULT_LANGUAGE = "en"
+
+# --- Batch Processing ---
+# Number of texts fed to spaCy's nlp.pipe() at once by PresidioAnonymizer.process_texts
+SPACY_BATCH_SIZE = int(os.getenv("SPACY_BATCH_SIZE", "32"))
+
+# --- Caching ---
+# Number of recent texts whose NLP artifacts (spaCy output) are reused by PresidioAnonymizer.analyze_text.
+# Off by default: cached entries hold the original (un-anonymized) text and its spaCy doc in memory,
+# per PresidioAnonymizer instance, until they are evicted
+NLP_ARTIFACTS_CACHE_SIZE = int(os.getenv("NLP_ARTIFACTS_CACHE_SIZE", "0"))
\ No newline at end of file
@@ -0,0 +1,34 @@
+import pytest
+from presidio_analyzer import RecognizerResult
+
+from config.config import NLP_PROFILES
+from utils.anonymizer_utils import DeanonymizeResult, PresidioAnonymizer
+
+TEXT = "My credit card is 4111 1111 1111 1111 and my email is john.doe@gmail.com"
+
+
+@pytest.fixture(scope="module")
+def anonymizer():
+    # The regex-only profile needs no spaCy model
+    return PresidioAnonymizer(nlp_config=NLP_PROFILES["regex_only"])
+
+
+def test_deanonymize_with_entities_restores_credit_card(anonymizer):
+    anonymized, analyzer_results = anonymizer.process_text(TEXT, show_analysis=True)
+    result = anonymizer.deanonymize_with_entities(anonymized.text, analyzer_results)
+    assert isinstance(result, DeanonymizeResult)
+    assert "4111 1111 1111 1111" in result.text
+    assert result.error is None
+
+
+def test_deanonymize_with_entities_without_encrypted_entities(anonymizer):
+    result = anonymizer.deanonymize_with_entities("no secrets", [RecognizerResult("EMAIL_ADDRESS", 0, 2, 1.0)])
+    assert result.text == "no secrets"
+    assert result.error is None
+
+
+def test_deanonymize_with_entities_reports_failure_in_error(anonymizer):
+    text = "card " + "A" * 64
+    result = anonymizer.deanonymize_with_entities(text, [RecognizerResult("CREDIT_CARD", 0, 4, 1.0)])
+    assert result.text == text
+    assert result.error.startswith("Deanonymization failed")
@@ -0,0 +1,65 @@
+import pytest
+from cryptography.fernet import InvalidToken
+from presidio_anonymizer.entities import InvalidParamError
+from presidio_anonymizer.operators import Decrypt
+
+from config.config import encryption_key
+from utils.anonymizer_utils import _ENCRYPTED_VALUE_RE
+from utils.operators import BatchEncrypt, FernetDecrypt, FernetEncrypt
+
+PARAMS = {"key": encryption_key}
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "4111 1111 1111 1111",
+    "0123456789abcdef",  # exactly one AES block
+    "0123456789abcdef" * 4,  # block-aligned, several blocks
+    "x" * 5000,
+    "ñandú 💳 4111",
+])
+def test_batch_encrypt_round_trips_through_decrypt(text):
+    encrypted = BatchEncrypt().operate(text, PARAMS)
+    assert Decrypt().operate(encrypted, PARAMS) == text
+
+
+def test_batch_encrypt_uses_random_iv():
+    assert BatchEncrypt().operate("4111", PARAMS) != BatchEncrypt().operate("4111", PARAMS)
+
+
+def test_batch_encrypt_accepts_str_key():
+    params = {"key": "0123456789abcdef"}
+    assert Decrypt().operate(BatchEncrypt().operate("4111", params), params) == "4111"
+
+
+
+@pytest.mark.parametrize("text", ["", "4111 1111 1111 1111", "ñandú 💳 4111"])
+def test_fernet_encrypt_round_trips_through_fernet_decrypt(text):
+    token = FernetEncrypt().operate(text, PARAMS)
+    assert FernetDecrypt().operate(token, PARAMS) == text
+
+
+def test_fernet_accepts_str_key():
+    params = {"key": "0123456789abcdef0123456789abcdef"}
+    assert FernetDecrypt().operate(FernetEncrypt().operate("4111", params), params) == "4111"
+
+
+@pytest.mark.parametrize("operator", [FernetEncrypt, FernetDecrypt])
+@pytest.mark.parametrize("key", [b"0123456789abcdef", "0123456789abcdef", None])
+def test_fernet_validate_rejects_non_32_byte_keys(operator, key):
+    with pytest.raises(InvalidParamError):
+        operator().validate({"key": key})
+
+
+def test_fernet_decrypt_rejects_tampered_token():
+    token = FernetEncrypt().operate("4111 1111 1111 1111", PARAMS)
+    tampered = token[:20] + ("A" if token[20] != "A" else "B") + token[21:]
+    with pytest.raises(InvalidToken):
+        FernetDecrypt().operate(tampered, PARAMS)
+
+
+def test_encrypted_value_re_matches_whole_fernet_token():
+    token = FernetEncrypt().operate("4111 1111 1111 1111", PARAMS)
+    assert token.endswith("=")
+    match = _ENCRYPTED_VALUE_RE.search(f"my credit card is {token}.")
+    assert match.group() == token + "."
@@ -0,0 +1,40 @@
+import pytest
+from presidio_analyzer import RecognizerResult
+
+from utils import span_merge
+from utils.span_merge import merge_spans
+
+
+@pytest.mark.skipif(span_merge.njit is None, reason="numba not installed")
+def test_merge_spans_drops_nested_results_of_the_same_type():
+    outer = RecognizerResult("PHONE_NUMBER", 10, 25, 0.75)
+    inner = RecognizerResult("PHONE_NUMBER", 14, 25, 0.4)
+    other_type = RecognizerResult("URL", 12, 20, 0.5)
+    assert merge_spans([inner, outer, other_type], min_results=2) == [outer, other_type]
+
+
+@pytest.mark.skipif(span_merge.njit is None, reason="numba not installed")
+def test_merge_spans_keeps_nested_results_with_a_higher_score():
+    outer = RecognizerResult("PHONE_NUMBER", 10, 25, 0.4)
+    inner = RecognizerResult("PHONE_NUMBER", 14, 25, 0.75)
+    assert merge_spans([outer, inner], min_results=2) == [outer, inner]
+
+
+def test_merge_spans_without_numba_returns_results_unchanged(monkeypatch):
+    monkeypatch.setattr(span_merge, "njit", None)
+    results = [RecognizerResult("PHONE_NUMBER", 10, 25, 0.75), RecognizerResult("PHONE_NUMBER", 14, 25, 0.4)]
+    assert merge_spans(results) is results
+
+
+def test_merge_spans_below_min_results_returns_results_unchanged():
+    results = [RecognizerResult("PHONE_NUMBER", 10, 25, 0.75), RecognizerResult("PHONE_NUMBER", 14, 25, 0.4)]
+    assert merge_spans(results) is results
+
+
+@pytest.mark.skipif(span_merge.njit is None, reason="numba not installed")
+def test_merge_spans_filters_from_min_results():
+    results = []
+    for i in range(span_merge.MIN_RESULTS // 2):
+        results += [RecognizerResult("PHONE_NUMBER", 20 * i, 20 * i + 15, 0.75),
+                    RecognizerResult("PHONE_NUMBER", 20 * i + 4, 20 * i + 15, 0.4)]
+    assert merge_spans(results) == results[::2]
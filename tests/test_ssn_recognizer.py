@@ -0,0 +1,26 @@
+import pytest
+from presidio_analyzer import EntityRecognizer
+from presidio_analyzer.predefined_recognizers import UsSsnRecognizer
+
+from utils.anonymizer_utils import _SSN_PATTERNS
+
+
+def _detect(recognizer, text):
+    results = EntityRecognizer.remove_duplicates(recognizer.analyze(text, ["US_SSN"], None))
+    return sorted((result.entity_type, result.start, result.end, result.score) for result in results)
+
+
+@pytest.mark.parametrize("text", [
+    "ssn 536-22-1234",
+    "ssn 536 22 1234",
+    "ssn 536.22.1234",
+    "ssn 536-22 1234",
+    "ssn 536221234",
+    "ssn 53622-1234",
+    "ssn 536-221234",
+    "ssn 078-05-1120",
+    "ssn 5362212345",
+    "a 536-22-1234 b 53622-1234 c 536221234",
+])
+def test_combined_patterns_match_stock_ssn_recognizer(text):
+    assert _detect(UsSsnRecognizer(patterns=_SSN_PATTERNS), text) == _detect(UsSsnRecognizer(), text)
@@ -1,7 +1,111 @@
-from presidio_analyzer import AnalyzerEngine
+import array
+import asyncio
+import functools
+import json
+import os
+import sys
+
+import regex
+
+try:
+    # RE2 matches in linear time with no backtracking; fall back to the stdlib engine
+    import re2 as re
+except ImportError:
+    import re
+
+from presidio_analyzer import AnalyzerEngine, Pattern, PatternRecognizer, RecognizerResult
+from presidio_analyzer.predefined_recognizers import UsSsnRecognizer
 from presidio_analyzer.nlp_engine import NlpEngineProvider
 from presidio_anonymizer import AnonymizerEngine, DeanonymizeEngine
-from config.config import NLP_CONFIGURATION, ANONYMIZATION_RULES, DEANONYMIZATION_RULES, DEFAULT_LANGUAGE
+from presidio_anonymizer.entities import EngineResult
+from utils.operators import BatchEncrypt, FernetDecrypt, FernetEncrypt
+from utils.span_merge import merge_spans
+from config.config import NLP_CONFIGURATION, ANONYMIZATION_RULES, DEANONYMIZATION_RULES, DEFAULT_LANGUAGE, SPACY_BATCH_SIZE, NLP_ARTIFACTS_CACHE_SIZE
+
+# Encrypted values: long URL-safe base64 strings (Fernet tokens end in '=' padding), optionally followed by a dot
+_ENCRYPTED_VALUE_RE = re.compile(r'[A-Za-z0-9_-]{50,}={0,2}\.?')
+
+# Presidio's five SSN patterns merged into two, one per score: the delimited format
+# (which also covers the weak dashed 3-2-4 pattern) and the other very weak formats
+_SSN_PATTERNS = [
+    Pattern("SSN delimited (medium)", r"\b([0-9]{3})[- .]([0-9]{2})[- .]([0-9]{4})\b", 0.5),
+    Pattern("SSN other formats (very weak)", r"\b(?:[0-9]{5}-[0-9]{4}|[0-9]{3}-[0-9]{6}|[0-9]{9})\b", 0.05),
+]
+
+
+class DeanonymizeResult(EngineResult):
+    """Presidio EngineResult with an `error` message, None unless deanonymization failed."""
+    
+    def __init__(self, text=None, items=None, error=None):
+        super().__init__(text=text, items=items)
+        self.error = error
+
+
+@functools.lru_cache(maxsize=4)
+def _get_engines(config_key):
+    """
+    Build (or reuse) the Presidio engines for a given NLP configuration.
+    
+    Loading the spaCy model dominates start-up time, so engines are cached
+    per configuration and shared between PresidioAnonymizer instances.
+    
+    Args:
+        config_key: NLP configuration serialized with _config_key()
+    
+    Returns:
+        Tuple of (analyzer, anonymizer)
+    """
+    nlp_engine_provider = NlpEngineProvider(nlp_configuration=json.loads(config_key))
+    analyzer = AnalyzerEngine(nlp_engine=nlp_engine_provider.create_engine())
+    _register_ssn_recognizer(analyzer)
+    _precompile_patterns(analyzer)
+    
+    anonymizer = AnonymizerEngine()
+    anonymizer.add_anonymizer(BatchEncrypt)
+    anonymizer.add_anonymizer(FernetEncrypt)
+    return analyzer, anonymizer
+
+
+def _register_ssn_recognizer(analyzer):
+    """
+    Replace Presidio's SSN recognizer with one that scans the text fewer times.
+    
+    The default recognizer runs five separate regexes over every text; this
+    one detects the same formats as "US_SSN", with the same validation,
+    context words and scores, using two patterns.
+    
+    Args:
+        analyzer: AnalyzerEngine whose registry should be updated
+    """
+    analyzer.registry.remove_recognizer("UsSsnRecognizer")
+    analyzer.registry.add_recognizer(UsSsnRecognizer(patterns=_SSN_PATTERNS))
+
+
+def _precompile_patterns(analyzer):
+    """
+    Compile the regexes of every pattern recognizer up front.
+    
+    Presidio compiles each pattern lazily on its first match, so the first
+    analyze call pays for dozens of compilations. Since engines are cached,
+    compiling them here happens once per NLP configuration.
+    
+    Args:
+        analyzer: AnalyzerEngine whose registry should be compiled
+    """
+    for recognizer in analyzer.registry.recognizers:
+        if not isinstance(recognizer, PatternRecognizer):
+            continue
+        flags = recognizer.global_regex_flags
+        for pattern in recognizer.patterns:
+            if pattern.compiled_regex is None or pattern.compiled_with_flags != flags:
+                pattern.compiled_regex = regex.compile(pattern.regex, flags=flags)
+                pattern.compiled_with_flags = flags
+
+
+def _config_key(nlp_config):
+    """Serialize an NLP configuration dict into a hashable cache key."""
+    return json.dumps(nlp_config, sort_keys=True)
+
 
 class PresidioAnonymizer:
     def __init__(self, nlp_config=None, anonymization_rules=None):
@@ -16,15 +120,30 @@ class PresidioAnonymizer:
         self.anonymization_rules = anonymization_rules or ANONYMIZATION_RULES
         self.deanonymization_rules = DEANONYMIZATION_RULES
         
-        # Initialize analyzer
-        nlp_engine_provider = NlpEngineProvider(nlp_configuration=self.nlp_config)
-        self.analyzer = AnalyzerEngine(nlp_engine=nlp_engine_provider.create_engine())
+        # Entity types that can be deanonymized, for fast membership tests in the per-entity loop
+        self._deanon_types = frozenset(map(sys.intern, self.deanonymization_rules))
+        
+        # Initialize analyzer and anonymizer (shared across instances with the same NLP config)
+        self.analyzer, self.anonymizer = _get_engines(_config_key(self.nlp_config))
         
-        # Initialize anonymizer
-        self.anonymizer = AnonymizerEngine()
-        self.deanonymizer = DeanonymizeEngine()
+        # Optionally reuse the NLP pass when the same text is analyzed again (e.g. with other entities).
+        # The cache keeps the original text (raw PII) in memory, so it is only enabled on request
+        self._process_nlp = self.analyzer.nlp_engine.process_text
+        if NLP_ARTIFACTS_CACHE_SIZE > 0:
+            self._process_nlp = functools.lru_cache(maxsize=NLP_ARTIFACTS_CACHE_SIZE)(self._process_nlp)
+        
+        # The deanonymizer is only built when a deanonymize_* method needs it
+        self._deanonymizer = None
+    
+    @property
+    def deanonymizer(self):
+        """Deanonymize engine, created on first use."""
+        if self._deanonymizer is None:
+            self._deanonymizer = DeanonymizeEngine()
+            self._deanonymizer.add_deanonymizer(FernetDecrypt)
+        return self._deanonymizer
     
-    def analyze_text(self, text, language=DEFAULT_LANGUAGE, entities=None):
+    def analyze_text(self, text, language=DEFAULT_LANGUAGE, entities=None, nlp_artifacts=None):
         """
         Analyze text to detect PII entities.
         
@@ -32,14 +151,19 @@ class PresidioAnonymizer:
             text: Text to analyze
             language: Language code (default: 'en')
             entities: List of specific entities to detect (optional)
+            nlp_artifacts: Pre-computed NLP artifacts for the text (optional)
         
         Returns:
             List of analyzer results
         """
+        if nlp_artifacts is None:
+            nlp_artifacts = self._process_nlp(text, language)
+        
         return self.analyzer.analyze(
             text=text,
             language=language,
-            entities=entities
+            entities=entities,
+            nlp_artifacts=nlp_artifacts
         )
     
     def anonymize_text(self, text, analyzer_results=None, language=DEFAULT_LANGUAGE, entities=None):
@@ -58,9 +182,10 @@ class PresidioAnonymizer:
         if analyzer_results is None:
             analyzer_results = self.analyze_text(text, language, entities)
         
+        # Nested same-type results are only pre-filtered for large result lists (see span_merge.MIN_RESULTS)
         return self.anonymizer.anonymize(
             text=text,
-            analyzer_results=analyzer_results,
+            analyzer_results=merge_spans(analyzer_results),
             operators=self.anonymization_rules
         )
         
@@ -102,48 +227,48 @@ class PresidioAnonymizer:
             original_entities: The original analyzer results from when text was anonymized
         
         Returns:
-            Deanonymized result object
+            DeanonymizeResult. Its `error` is None on success; if deanonymization fails, its
+            text is the anonymized text and `error` describes the failure
         """
-        # Filter entities that can be deanonymized (only encrypted ones)
-        deanonymizable_entities = []
-        
-        for entity in original_entities:
-            if entity.entity_type in self.deanonymization_rules:
-                # We need to create new entities based on the encrypted text positions
-                # This is a simplified approach - finding encrypted values in the anonymized text
-                if entity.entity_type == "CREDIT_CARD":
-                    # Look for encrypted credit card patterns in the anonymized text
-                    import re
-                    # Look for encrypted patterns (Presidio encrypted values with dots at the end)
-                    encrypted_pattern = r'[A-Za-z0-9_-]{50,}\.?'
-                    matches = re.finditer(encrypted_pattern, anonymized_text)
-                    
-                    for match in matches:
-                        # Create a new entity for the encrypted value
-                        from presidio_analyzer import RecognizerResult
-                        encrypted_entity = RecognizerResult(
-                            entity_type="CREDIT_CARD",
-                            start=match.start(),
-                            end=match.end(),
-                            score=1.0
-                        )
-                        deanonymizable_entities.append(encrypted_entity)
-        
-        if not deanonymizable_entities:
-            # Return the original text if no entities can be deanonymized
-            from presidio_anonymizer.entities import EngineResult
-            return EngineResult(text=anonymized_text)
+        # Only encrypted entities can be deanonymized; skip the text scan when none were detected
+        if not any(entity.entity_type in self._deanon_types for entity in original_entities):
+            return DeanonymizeResult(text=anonymized_text)
+        
+        # We need to create new entities based on the encrypted text positions
+        # This is a simplified approach - finding encrypted values in the anonymized text
+        # (CREDIT_CARD is the only encrypted entity). Spans are kept as parallel arrays and
+        # only turned into RecognizerResults for Presidio
+        entity_types = []
+        starts = array.array('q')
+        ends = array.array('q')
+        
+        for match in _ENCRYPTED_VALUE_RE.finditer(anonymized_text):
+            # Record the span of the encrypted value
+            entity_types.append("CREDIT_CARD")
+            starts.append(match.start())
+            ends.append(match.end())
+        
+        if not entity_types:
+            # Return the original text if no encrypted values are left in the text
+            return DeanonymizeResult(text=anonymized_text)
+        
+        deanonymizable_entities = [
+            RecognizerResult(entity_type=entity_type, start=start, end=end, score=1.0)
+            for entity_type, start, end in zip(entity_types, starts, ends)
+        ]
         
         try:
-            return self.deanonymizer.deanonymize(
+            result = self.deanonymizer.deanonymize(
                 text=anonymized_text,
                 entities=deanonymizable_entities,
                 operators=self.deanonymization_rules
             )
         except Exception as e:
-            # If deanonymization fails, return the original text with an error note
-            from presidio_anonymizer.entities import EngineResult
-            return EngineResult(text=f"{anonymized_text}\n\n[Note: Deanonymization failed: {str(e)}]")
+            # If deanonymization fails, return the original text; the error note is kept
+            # apart in `error` so the (possibly large) text is not copied to append it
+            return DeanonymizeResult(text=anonymized_text, error=f"Deanonymization failed: {e}")
+        
+        return DeanonymizeResult(text=result.text, items=result.items)
 
     def process_text(self, text, language=DEFAULT_LANGUAGE, entities=None, show_analysis=False):
         """
@@ -165,3 +290,73 @@ class PresidioAnonymizer:
         if show_analysis:
             return anonymized_result, analyzer_results
         return anonymized_result
+
+    def process_texts(self, texts, language=DEFAULT_LANGUAGE, entities=None, batch_size=None, show_analysis=False):
+        """
+        Analyze and anonymize several texts, running spaCy over them in batches.
+        
+        Args:
+            texts: List of texts to process
+            language: Language code (default: 'en')
+            entities: List of specific entities to detect (optional)
+            batch_size: Number of texts per nlp.pipe() batch (default: SPACY_BATCH_SIZE)
+            show_analysis: Whether to return analysis results (default: False)
+        
+        Returns:
+            List of (anonymized_result, analyzer_results) tuples if show_analysis=True
+            Otherwise list of anonymized_result
+        """
+        batch = self.analyzer.nlp_engine.process_batch(
+            texts=texts,
+            language=language,
+            batch_size=batch_size or SPACY_BATCH_SIZE
+        )
+        
+        processed = []
+        for text, nlp_artifacts in batch:
+            analyzer_results = self.analyze_text(text, language, entities, nlp_artifacts=nlp_artifacts)
+            anonymized_result = self.anonymize_text(text, analyzer_results)
+            processed.append((anonymized_result, analyzer_results) if show_analysis else anonymized_result)
+        
+        return processed
+
+    async def process_text_async(self, text, language=DEFAULT_LANGUAGE, entities=None, show_analysis=False):
+        """
+        Async version of process_text, run in a worker thread so the event loop is not blocked.
+        
+        Args:
+            text: Text to process
+            language: Language code (default: 'en')
+            entities: List of specific entities to detect (optional)
+            show_analysis: Whether to return analysis results (default: False)
+        
+        Returns:
+            Same as process_text
+        """
+        return await asyncio.to_thread(self.process_text, text, language, entities, show_analysis)
+    
+    async def process_texts_async(self, texts, language=DEFAULT_LANGUAGE, entities=None, show_analysis=False,
+                                  max_concurrency=None):
+        """
+        Process several texts concurrently in worker threads.
+        
+        spaCy releases the GIL during model inference, so running up to one text
+        per CPU core at a time scales across cores; more threads only add contention.
+        
+        Args:
+            texts: List of texts to process
+            language: Language code (default: 'en')
+            entities: List of specific entities to detect (optional)
+            show_analysis: Whether to return analysis results (default: False)
+            max_concurrency: Maximum texts processed at once (default: number of CPUs)
+        
+        Returns:
+            List with the process_text result of each text, in input order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or os.cpu_count() or 1)
+        
+        async def process(text):
+            async with semaphore:
+                return await self.process_text_async(text, language, entities, show_analysis)
+        
+        return await asyncio.gather(*(process(text) for text in texts))
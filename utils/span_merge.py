@@ -0,0 +1,84 @@
+try:
+    # The sweep only pays off compiled to machine code; without Numba the pre-filter is skipped
+    import numpy as np
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Fewest results for which merge_spans runs the sweep. Measured through AnonymizerEngine.anonymize
+# after JIT warm-up: below ~200 results, building the arrays costs as much as the sweep saves
+# (5 results: 0.045ms without the filter vs 0.064ms with it); at 200 results the cost is within
+# noise without nesting (7.9ms vs 7.8ms) and a third lower with nested same-type results (1.6ms vs 1.0ms)
+MIN_RESULTS = 200
+
+
+def _contained_mask(starts, ends, scores, type_ids, order, n_types):
+    """
+    Mark the spans that are covered by an earlier span of the same type with an equal or higher score.
+
+    Args:
+        starts: Span start offsets
+        ends: Span end offsets
+        scores: Span scores
+        type_ids: Entity type of each span, as an integer id
+        order: Span indices sorted by start, then longest first, then highest score first
+        n_types: Number of distinct type ids
+
+    Returns:
+        Boolean mask of the spans to keep
+    """
+    keep = np.ones(starts.shape[0], dtype=np.bool_)
+    # Kept span reaching furthest to the right, per entity type
+    covers = np.full(n_types, -1, dtype=np.int64)
+    for i in range(order.shape[0]):
+        current = order[i]
+        cover = covers[type_ids[current]]
+        if cover < 0 or ends[current] > ends[cover]:
+            covers[type_ids[current]] = current
+        elif scores[current] <= scores[cover]:
+            keep[current] = False
+    return keep
+
+
+if njit is not None:
+    _contained_mask = njit(cache=True)(_contained_mask)
+
+
+def merge_spans(analyzer_results, min_results=MIN_RESULTS):
+    """
+    Drop analyzer results whose span lies inside another result of the same entity type.
+
+    Presidio's anonymizer usually merges these into the enclosing result in its own
+    (quadratic, object based) conflict resolution; removing them in a single sorted sweep
+    first leaves it far fewer results to compare. Results of different types are always
+    left for Presidio to resolve. The output is not always identical to Presidio's: a
+    dropped result can still decide which type wins a tie between equal spans of
+    different types, so in such rare cases another entity type may be chosen.
+
+    Requires the optional numba package; without it, or with fewer than `min_results`
+    results, the results are returned unchanged, since the sweep would cost more than
+    it saves.
+
+    Args:
+        analyzer_results: List of analyzer results
+        min_results: Fewest results for which the sweep is run (default: MIN_RESULTS)
+
+    Returns:
+        List of the remaining analyzer results, in their original order
+    """
+    count = len(analyzer_results)
+    if njit is None or count < max(min_results, 2):
+        return analyzer_results
+
+    type_index = {}
+    type_ids = np.fromiter(
+        (type_index.setdefault(result.entity_type, len(type_index)) for result in analyzer_results),
+        dtype=np.int64, count=count
+    )
+    starts = np.fromiter((result.start for result in analyzer_results), dtype=np.int64, count=count)
+    ends = np.fromiter((result.end for result in analyzer_results), dtype=np.int64, count=count)
+    scores = np.fromiter((result.score for result in analyzer_results), dtype=np.float64, count=count)
+
+    order = np.lexsort((-scores, -ends, starts))
+    keep = _contained_mask(starts, ends, scores, type_ids, order, len(type_index))
+    return [analyzer_results[i] for i in np.flatnonzero(keep)]